@@ -0,0 +1,111 @@
+"""
+Tests for YOLO label parsing.
+"""
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from utils import yolo_format
+from utils.yolo_format import YOLOAnnotation, load_annotations
+
+
+# Lines the compiled parser must hand back to from_yolo_string: malformed
+# numbers, non-integer class IDs, odd coordinate counts, and numbers it
+# can't convert exactly
+FALLBACK_LINES = [
+    "abc",
+    "0 0.5",
+    "0 0.1 0.2 0.3",
+    "1.5 0.1 0.2 0.3 0.4 0.5 0.6",
+    "2 0.1x 0.2 0.3 0.4 0.5 0.6",
+    "3 1e 0.2 0.3 0.4 0.5 0.6",
+    "4 - 0.2 0.3 0.4 0.5 0.6",
+    "5 0.1.2 0.2 0.3 0.4 0.5 0.6",
+    "6 1e-3 2.5E+0 -0.0 +0.25 3e1 .5",
+    "7 0.12345678901234567 0.3 0.1 0.2 0.7 0.9",
+    "8 1e-30 0.2 0.3 0.4 0.5 0.6",
+    "9 0.1\t0.2  0.3 0.4\r",
+]
+
+
+def _write_label_file(path, min_bytes):
+    """Write random 6-decimal polygons plus FALLBACK_LINES until min_bytes is reached"""
+    rng = random.Random(0)
+    lines = []
+    size = 0
+    while size < min_bytes:
+        n_points = rng.randint(3, 40)
+        coords = ' '.join(f'{rng.random():.6f}' for _ in range(2 * n_points))
+        line = f'{rng.randint(0, 79)} {coords}'
+        lines.append(line)
+        size += len(line) + 1
+        if len(lines) % 50 == 0:
+            lines.extend(FALLBACK_LINES)
+            lines.append("")
+    with open(path, 'w', newline='') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+@unittest.skipIf(yolo_format._parse_label_buffer is None, "numba is not installed")
+class CompiledLoaderTest(unittest.TestCase):
+    """The compiled loader must give exactly what the NumPy loader gives"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.txt')
+        os.close(fd)
+        _write_label_file(self.path, 4 * yolo_format.COMPILED_PARSE_MIN_BYTES)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _assert_same(self, compiled, reference):
+        self.assertEqual(len(compiled), len(reference))
+        for a, b in zip(compiled, reference):
+            self.assertEqual(a.class_id, b.class_id)
+            # Bitwise equality: parsing must be correctly rounded, like float()
+            np.testing.assert_array_equal(a.points, b.points)
+            self.assertEqual(np.signbit(a.points).tolist(), np.signbit(b.points).tolist())
+
+    def test_matches_numpy_loader(self):
+        with mock.patch('builtins.print'):
+            compiled = load_annotations(self.path)
+            with mock.patch.object(yolo_format, 'COMPILED_PARSE_MIN_BYTES', float('inf')):
+                reference = load_annotations(self.path)
+        self._assert_same(compiled, reference)
+
+    def test_fallback_lines(self):
+        valid = [line for line in FALLBACK_LINES if _parses(line)]
+        # Repeat the lines so the file is large enough for the compiled path
+        fd, path = tempfile.mkstemp(suffix='.txt')
+        os.close(fd)
+        try:
+            with open(path, 'w', newline='') as f:
+                block = '\n'.join(FALLBACK_LINES) + '\n'
+                f.write(block * (yolo_format.COMPILED_PARSE_MIN_BYTES // len(block) + 1))
+            with mock.patch('builtins.print') as printed:
+                compiled = load_annotations(path)
+            repeats = yolo_format.COMPILED_PARSE_MIN_BYTES // len(block) + 1
+            self.assertEqual(len(compiled), len(valid) * repeats)
+            # Only count the loader's warnings (numba may print while compiling)
+            warnings = [c for c in printed.call_args_list
+                        if c.args and str(c.args[0]).startswith("Warning: Skipping invalid line")]
+            self.assertEqual(len(warnings), (len(FALLBACK_LINES) - len(valid)) * repeats)
+            self._assert_same(compiled[:len(valid)], [YOLOAnnotation.from_yolo_string(l) for l in valid])
+        finally:
+            os.remove(path)
+
+
+def _parses(line):
+    try:
+        YOLOAnnotation.from_yolo_string(line)
+        return True
+    except ValueError:
+        return False
+
+
+if __name__ == '__main__':
+    unittest.main()
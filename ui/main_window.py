@@ -419,7 +419,8 @@ class MainWindow(QMainWindow):
 
         # Load image
         image_path = self.file_handler.get_current_image_path()
-        success = self.canvas.load_image(image_path)
+        image_data = self.file_handler.get_current_image_bytes()
+        success = self.canvas.load_image(image_path, image_data)
 
         if not success:
             QMessageBox.critical(self, "Error", f"Failed to load image: {image_path}")
@@ -433,7 +434,7 @@ class MainWindow(QMainWindow):
         self.current_annotations = []
         for yolo_ann in yolo_annotations:
             class_name = self.class_names[yolo_ann.class_id] if yolo_ann.class_id < len(self.class_names) else f"Class {yolo_ann.class_id}"
-            annotation = Annotation(yolo_ann.class_id, yolo_ann.points, class_name)
+            annotation = Annotation(yolo_ann.class_id, yolo_ann.to_point_list(), class_name)
             self.current_annotations.append(annotation)
 
         # Update canvas
@@ -796,10 +797,7 @@ class MainWindow(QMainWindow):
     def _reset_to_defaults(self):
         """Reset application to default state."""
         # Reset annotation tab
-        self.file_handler.images_dir = None
-        self.file_handler.labels_dir = None
-        self.file_handler.image_files = []
-        self.file_handler.current_index = 0
+        self.file_handler.set_directories(None, None)
 
         self.images_folder_label.setText("Images Folder: Not selected")
         self.labels_folder_label.setText("Labels Folder: Not selected")
@@ -2,15 +2,47 @@
 File handling utilities for managing images and annotations.
 """
 import os
-from typing import List, Tuple
-from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+
+def list_files_by_suffix(directory: str, suffixes: frozenset) -> List[str]:
+    """
+    List the files in a directory whose extension is in suffixes
+
+    Args:
+        directory: Directory to scan (not recursive)
+        suffixes: Lowercase extensions without the leading dot, e.g. {'jpg'}
+
+    Returns:
+        Sorted filenames
+    """
+    # scandir yields the file type from the directory listing itself,
+    # so skipping non-files costs no extra stat calls
+    with os.scandir(directory) as entries:
+        names = []
+        for entry in entries:
+            # No dot gives an empty stem, and so does a dotfile such as
+            # ".mp4", which (like Path.suffix) has no extension
+            stem, _, ext = entry.name.rpartition('.')
+            if stem and ext.lower() in suffixes and entry.is_file():
+                names.append(entry.name)
+    # Sort only the kept names, in place
+    names.sort()
+    return names
 
 
 class FileHandler:
     """Handles file operations for images and annotations"""
 
     # Supported image formats
-    IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
+    IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'})
+    # Same set without the leading dot, as list_files_by_suffix expects
+    _IMAGE_SUFFIXES = frozenset(ext[1:] for ext in IMAGE_EXTENSIONS)
+
+    # Number of raw image files kept in memory (current image and neighbors)
+    PREFETCH_CACHE_SIZE = 4
 
     def __init__(self, images_dir: str = None, labels_dir: str = None):
         """
@@ -21,8 +53,14 @@ class FileHandler:
         self.images_dir = images_dir
         self.labels_dir = labels_dir
         self.image_files: List[str] = []
+        self._image_paths: List[str] = []
+        self._label_paths: List[str] = []
         self.current_index = 0
 
+        # Background reads of neighboring images, keyed by image path
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-prefetch")
+        self._prefetch_cache: "OrderedDict[str, Future]" = OrderedDict()
+
         if images_dir:
             self.load_image_list()
 
@@ -34,17 +72,27 @@ class FileHandler:
 
     def load_image_list(self) -> None:
         """Load list of image files from the images directory"""
+        # Files may have changed on disk, drop any prefetched data
+        self._prefetch_cache.clear()
+
         if not self.images_dir or not os.path.exists(self.images_dir):
             self.image_files = []
+            self._image_paths = []
+            self._label_paths = []
             self.current_index = 0
             return
 
-        # Fast method: just check extension, don't check if it's a file
-        # This is much faster with thousands of files
-        self.image_files = [
-            file for file in sorted(os.listdir(self.images_dir))
-            if Path(file).suffix.lower() in self.IMAGE_EXTENSIONS
-        ]
+        self.image_files = list_files_by_suffix(self.images_dir, self._IMAGE_SUFFIXES)
+
+        # Resolve full paths once so navigation is a plain index lookup
+        self._image_paths = [os.path.join(self.images_dir, name) for name in self.image_files]
+        if self.labels_dir:
+            self._label_paths = [
+                os.path.join(self.labels_dir, os.path.splitext(name)[0] + '.txt')
+                for name in self.image_files
+            ]
+        else:
+            self._label_paths = []
 
         self.current_index = 0 if self.image_files else 0
 
@@ -52,15 +100,57 @@ class FileHandler:
         """Get the path to the current image"""
         if not self.image_files:
             return ""
-        return os.path.join(self.images_dir, self.image_files[self.current_index])
+        return self._image_paths[self.current_index]
 
     def get_current_label_path(self) -> str:
         """Get the path to the current label file"""
-        if not self.image_files or not self.labels_dir:
+        if not self.image_files or not self._label_paths:
             return ""
+        return self._label_paths[self.current_index]
+
+    def get_current_image_bytes(self) -> Optional[bytes]:
+        """
+        Get the raw file contents of the current image.
+
+        Uses data prefetched in the background when available, then starts
+        prefetching the next and previous images.
 
-        image_name = Path(self.image_files[self.current_index]).stem
-        return os.path.join(self.labels_dir, f'{image_name}.txt')
+        Returns:
+            File contents, or None if there is no image or it can't be read
+        """
+        if not self.image_files:
+            return None
+
+        data = self._prefetch(self.current_index).result()
+
+        self._prefetch(self.current_index + 1)
+        self._prefetch(self.current_index - 1)
+        return data
+
+    def _prefetch(self, index: int) -> Optional[Future]:
+        """Start (or reuse) a background read of the image at index"""
+        if not 0 <= index < len(self._image_paths):
+            return None
+
+        path = self._image_paths[index]
+        future = self._prefetch_cache.get(path)
+        if future is None:
+            future = self._prefetch_executor.submit(self._read_bytes, path)
+            self._prefetch_cache[path] = future
+        self._prefetch_cache.move_to_end(path)
+
+        while len(self._prefetch_cache) > self.PREFETCH_CACHE_SIZE:
+            self._prefetch_cache.popitem(last=False)
+        return future
+
+    @staticmethod
+    def _read_bytes(path: str) -> Optional[bytes]:
+        """Read a whole file, returning None on failure"""
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
 
     def next_image(self) -> bool:
         """
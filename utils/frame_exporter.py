@@ -0,0 +1,145 @@
+"""
+Background writer for exported video frames and their YOLO labels.
+"""
+import os
+import queue
+from pathlib import Path
+import cv2
+from PySide6.QtCore import Qt, QObject, QThread, QCoreApplication, Signal, Slot
+from utils.yolo_format import convert_results_to_yolo_strings
+
+
+class FrameExportWorker(QObject):
+    """Writes exported frames and label files on its own thread"""
+
+    # Emits (image_path, success, error message)
+    export_finished = Signal(str, bool, str)
+
+    # Internal: wakes the worker thread after a job is queued
+    _job_queued = Signal()
+
+    # Maximum number of exports waiting to be written
+    MAX_PENDING = 64
+
+    # JPEG quality used for exported frames
+    JPEG_QUALITY = 90
+
+    def __init__(self):
+        super().__init__()
+
+        self._jobs = queue.Queue(maxsize=self.MAX_PENDING)
+        self._ensured_dirs = set()  # Export folders whose images/ and labels/ exist
+
+        self._thread = QThread()
+        self.moveToThread(self._thread)
+        self._job_queued.connect(self._process_jobs)
+        self._thread.start()
+
+        # Finish pending writes before the application exits
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown, Qt.DirectConnection)
+
+    def submit(self, output_dir: str, base_name: str, frame_np, results) -> bool:
+        """
+        Queue a frame for export
+
+        Args:
+            output_dir: Export folder (images/ and labels/ are created inside)
+            base_name: File name without extension
+            frame_np: Frame in BGR format; must not be modified after submitting
+            results: Inference results to write as labels, or None for no label file
+
+        Returns:
+            True if queued, False if too many exports are already pending
+        """
+        try:
+            self._jobs.put_nowait((output_dir, base_name, frame_np, results))
+        except queue.Full:
+            return False
+        self._job_queued.emit()
+        return True
+
+    def forget_directories(self):
+        """Re-check export subfolders on the next write (e.g. after the folder changed)"""
+        self._ensured_dirs.clear()
+
+    def shutdown(self):
+        """Stop the worker thread after pending exports are written"""
+        self._thread.quit()
+        self._thread.wait()
+        # Jobs queued after the worker's last pass are written here
+        self._process_jobs()
+
+    @Slot()
+    def _process_jobs(self):
+        """Write every queued export (runs on the worker thread)"""
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            image_path, ok, error = self._write_export(*job)
+            self.export_finished.emit(image_path, ok, error)
+
+    def _ensure_dirs(self, output_dir):
+        """Create images/ and labels/ in output_dir unless already known to exist"""
+        if output_dir not in self._ensured_dirs:
+            os.makedirs(os.path.join(output_dir, "images"), exist_ok=True)
+            os.makedirs(os.path.join(output_dir, "labels"), exist_ok=True)
+            self._ensured_dirs.add(output_dir)
+
+    def _write_with_dirs(self, output_dir, write):
+        """
+        Run write() after making sure the export subfolders exist
+
+        The subfolders are only created once per output folder. If one was
+        removed since then, write() fails with FileNotFoundError; the folders
+        are then recreated and the write is retried once.
+        """
+        self._ensure_dirs(output_dir)
+        try:
+            write()
+        except FileNotFoundError:
+            self._ensured_dirs.discard(output_dir)
+            self._ensure_dirs(output_dir)
+            write()
+
+    def _write_export(self, output_dir, base_name, frame_np, results):
+        """
+        Save the frame image and, if results are given, its YOLO label file
+
+        Returns:
+            (image_path, success, error message)
+        """
+        images_dir = os.path.join(output_dir, "images")
+        labels_dir = os.path.join(output_dir, "labels")
+        image_path = os.path.join(images_dir, f"{base_name}.jpg")
+        label_path = os.path.join(labels_dir, f"{base_name}.txt")
+
+        try:
+            # Encode in memory, then write the file in one call
+            ok, buf = cv2.imencode('.jpg', frame_np, [cv2.IMWRITE_JPEG_QUALITY, self.JPEG_QUALITY])
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+            self._write_with_dirs(output_dir, lambda: Path(image_path).write_bytes(buf))
+        except Exception as e:
+            return image_path, False, f"Failed to save image: {e}"
+
+        if results is not None:
+            try:
+                yolo_strings = convert_results_to_yolo_strings(results)
+                if yolo_strings:
+                    # Build the whole file first and write it in one call
+                    payload = '\n'.join(yolo_strings) + '\n'
+                    self._write_with_dirs(output_dir, lambda: Path(label_path).write_text(payload))
+                else:
+                    # An empty file marks a frame with no detections. Truncate
+                    # rather than touch so labels from an earlier export of the
+                    # same frame do not survive.
+                    self._write_with_dirs(output_dir, lambda: os.close(
+                        os.open(label_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o666)))
+            except Exception as e:
+                return image_path, False, f"Image saved, but failed to save labels: {e}"
+
+        return image_path, True, ""
@@ -31,6 +31,7 @@ class SessionManager:
                 "active_model_slot": 0,
                 "inference_threshold": 0.5,
                 "inference_enabled": True,
+                "inference_batch_size": 1,
                 "current_video_index": 0
             }
         }
@@ -2,15 +2,17 @@
 Video handling utilities for managing video files.
 """
 import os
-from typing import List
-from pathlib import Path
+from typing import List, Optional
+from utils.file_handler import list_files_by_suffix
 
 
 class VideoHandler:
     """Handles file operations for videos"""
 
     # Supported video formats
-    VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv'}
+    VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv'})
+    # Same set without the leading dot, as list_files_by_suffix expects
+    _VIDEO_SUFFIXES = frozenset(ext[1:] for ext in VIDEO_EXTENSIONS)
 
     def __init__(self, videos_dir: str = None):
         """
@@ -20,6 +22,7 @@ class VideoHandler:
         self.videos_dir = videos_dir
         self.video_files: List[str] = []
         self.current_index = 0
+        self.dir_mtime_ns: Optional[int] = None  # Directory mtime when video_files was listed
 
         if videos_dir:
             self.load_video_list()
@@ -29,18 +32,50 @@ class VideoHandler:
         self.videos_dir = videos_dir
         self.load_video_list()
 
+    def set_directory_cached(self, videos_dir: str, video_files: List[str],
+                             dir_mtime_ns: Optional[int]) -> bool:
+        """
+        Set the videos directory, reusing a previously listed set of files.
+
+        The cached list is only trusted if the directory's modification time
+        still matches, i.e. no files were added, removed or renamed since.
+        Otherwise the directory is scanned as in set_directory.
+
+        Args:
+            videos_dir: Directory containing video files
+            video_files: Video filenames listed earlier (sorted)
+            dir_mtime_ns: Directory mtime (ns) recorded when they were listed
+
+        Returns:
+            True if the cached list was used, False if the directory was rescanned
+        """
+        try:
+            current_mtime_ns = os.stat(videos_dir).st_mtime_ns
+        except OSError:
+            current_mtime_ns = None
+
+        if dir_mtime_ns is None or current_mtime_ns != dir_mtime_ns or video_files is None:
+            self.set_directory(videos_dir)
+            return False
+
+        self.videos_dir = videos_dir
+        self.video_files = list(video_files)
+        self.dir_mtime_ns = current_mtime_ns
+        self.current_index = 0
+        return True
+
     def load_video_list(self) -> None:
         """Load list of video files from the videos directory"""
         if not self.videos_dir or not os.path.exists(self.videos_dir):
             self.video_files = []
+            self.dir_mtime_ns = None
             self.current_index = 0
             return
 
-        # Fast method: just check extension
-        self.video_files = [
-            file for file in sorted(os.listdir(self.videos_dir))
-            if Path(file).suffix.lower() in self.VIDEO_EXTENSIONS
-        ]
+        # Taken before scanning so a change during the scan invalidates it
+        self.dir_mtime_ns = os.stat(self.videos_dir).st_mtime_ns
+
+        self.video_files = list_files_by_suffix(self.videos_dir, self._VIDEO_SUFFIXES)
 
         self.current_index = 0 if self.video_files else 0
 
@@ -1,12 +1,21 @@
 """
 Video processing thread for smooth playback and inference.
 """
+import time
+import weakref
+from collections import OrderedDict, deque
 import cv2
 import numpy as np
 from PySide6.QtCore import QThread, Signal, QMutex, QMutexLocker
 from PySide6.QtGui import QImage
 from utils.yolo_inference import YOLOInference
 
+# cv2.VIDEO_ACCELERATION_* value -> name, for reporting the decoder in use
+_HW_ACCELERATION_NAMES = {
+    getattr(cv2, name): name[len('VIDEO_ACCELERATION_'):]
+    for name in dir(cv2) if name.startswith('VIDEO_ACCELERATION_')
+}
+
 
 class VideoThread(QThread):
     """Thread for processing video frames"""
@@ -22,6 +31,16 @@ class VideoThread(QThread):
     # frame_data_ready_for_export sends (frame_np, frame_number, video_name, results)
     frame_data_ready_for_export = Signal(object, int, str, object)
 
+    # Number of decode buffers shared zero-copy with the GUI during playback
+    DISPLAY_BUFFER_COUNT = 2
+
+    # Memory budget for decoded frames kept for slider scrubbing
+    # (~32 frames at 1080p, ~8 at 4K)
+    SCRUB_CACHE_BYTES = 200 * 1024 * 1024
+
+    # Hardware acceleration last printed by _open_capture
+    _reported_hw_acceleration = None
+
     def __init__(self):
         super().__init__()
 
@@ -34,6 +53,11 @@ class VideoThread(QThread):
         self.cap = None
         self.fps = 0
         self.current_frame_number = 0  # Track current frame manually
+        self._frame_idx = 0  # Index of the next frame the capture will decode
+        self._frame_buf = None  # Decode target reused across playback frames
+        self._display_slots = []  # [buffer, weakref to its last wrapper] pairs, see _acquire_display_slot
+        self._scrub_cache = OrderedDict()  # frame_number -> raw decoded frame, LRU order
+        self._scrub_cache_bytes = 0  # Total nbytes of the cached frames
         self.mutex = QMutex()
         
         # Connect internal signal to handler slot running in this thread context
@@ -42,6 +66,8 @@ class VideoThread(QThread):
     def set_video(self, video_path: str):
         """Set the video file to play"""
         self.video_path = video_path
+        with QMutexLocker(self.mutex):
+            self._clear_scrub_cache()
         self.should_stop = True  # Stop current playback
 
     def set_inference_engine(self, engine: YOLOInference):
@@ -90,7 +116,7 @@ class VideoThread(QThread):
             return
 
         # Open video
-        self.cap = cv2.VideoCapture(self.video_path)
+        self.cap = self._open_capture(self.video_path)
 
         if not self.cap.isOpened():
             self.error_occurred.emit(f"Failed to open video: {self.video_path}")
@@ -103,9 +129,36 @@ class VideoThread(QThread):
 
         self.duration_changed.emit(duration_ms, total_frames)
 
+        # Preallocate one decode buffer for playback so each frame is decoded
+        # in place instead of allocating a new array
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if width > 0 and height > 0:
+            self._frame_buf = np.empty((height, width, 3), dtype=np.uint8)
+            # Display buffers: frames decoded into these are emitted through a
+            # QImage that wraps the buffer, with no per-frame copy
+            self._display_slots = [
+                [np.empty((height, width, 3), dtype=np.uint8), None]
+                for _ in range(self.DISPLAY_BUFFER_COUNT)
+            ]
+        else:
+            self._frame_buf = None
+            self._display_slots = []
+
         self.should_stop = False
         self.is_playing = True
         self.current_frame_number = 0
+        self._frame_idx = 0
+
+        # Playback clock: frame N since clock_start is due at
+        # clock_start + N * frame_interval
+        frame_interval = 1.0 / self.fps if self.fps > 0 else 0.0
+        clock_start = time.monotonic()
+        clock_frames = 0
+
+        # Frames decoded (and inferred) ahead of display, as
+        # (qt_image, position_ms, frame_number)
+        pending = deque()
 
         while not self.should_stop:
             # Handle seek
@@ -113,53 +166,126 @@ class VideoThread(QThread):
                 with QMutexLocker(self.mutex):
                     if self.cap and self.cap.isOpened():
                          self.cap.set(cv2.CAP_PROP_POS_MSEC, self.seek_position)
+                         # Re-sync the local frame counter once after the seek
                          self.current_frame_number = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+                         self._frame_idx = self.current_frame_number
                 self.seek_position = -1
+                pending.clear()
+                clock_start = time.monotonic()
+                clock_frames = 0
 
             # Handle pause
             if self.is_paused:
+                if pending:
+                    # Rewind past frames that were decoded ahead but never shown
+                    with QMutexLocker(self.mutex):
+                        if self.cap and self.cap.isOpened():
+                            self.cap.set(cv2.CAP_PROP_POS_FRAMES, pending[0][2])
+                            self._frame_idx = pending[0][2]
+                    pending.clear()
                 self.msleep(100)
+                # Restart the clock so resuming does not try to catch up
+                clock_start = time.monotonic()
+                clock_frames = 0
                 continue
 
-            # Read frame
-            with QMutexLocker(self.mutex):
-                if not self.cap or not self.cap.isOpened():
-                     break
-                ret, frame = self.cap.read()
-                
-                # Capture position immediately if read was successful
-                if ret:
-                    position_ms = int(self.cap.get(cv2.CAP_PROP_POS_MSEC))
-                    # CAP_PROP_POS_FRAMES returns the index of the next frame to be captured
-                    self.current_frame_number = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
-            
-            if not ret:
-                # End of video
-                self.playback_finished.emit()
-                break
-
-            # Run inference if enabled
-            if self.inference_engine and self.inference_engine.is_loaded() and self.inference_engine.enabled:
-                results = self.inference_engine.predict(frame)
-                frame = self.inference_engine.draw_results(frame, results)
-
-            # Convert frame to QImage
-            qt_image = self._convert_frame_to_qimage(frame)
+            if not pending:
+                inference_active = (self.inference_engine and self.inference_engine.is_loaded()
+                                    and self.inference_engine.enabled)
+                batch_size = max(1, self.inference_engine.batch_size) if inference_active else 1
+
+                # Read frames
+                frames = []
+                with QMutexLocker(self.mutex):
+                    if not self.cap or not self.cap.isOpened():
+                         break
+
+                    # When processing falls more than a frame behind, skip the late
+                    # frames with grab() instead of drifting. grab() still decodes
+                    # (FFmpeg needs each frame as a reference); it only saves the
+                    # colour conversion and copy that retrieve() would do
+                    if frame_interval > 0:
+                        lag = time.monotonic() - (clock_start + clock_frames * frame_interval)
+                        while lag > frame_interval and self.cap.grab():
+                            clock_frames += 1
+                            self._frame_idx += 1
+                            lag -= frame_interval
+
+                    # Batched frames must not share the decode buffer
+                    frame_buf = self._frame_buf if batch_size == 1 else None
+                    # Without inference the decoded frame is shown as-is, so
+                    # decode straight into a buffer the GUI can read from
+                    display_slot = None
+                    if not inference_active:
+                        display_slot = self._acquire_display_slot()
+                        if display_slot is not None:
+                            frame_buf = display_slot[0]
+                    for _ in range(batch_size):
+                        # read() decodes into the buffer when its shape matches and
+                        # falls back to a fresh array otherwise
+                        ret, frame = self.cap.read(frame_buf)
+                        if not ret:
+                            break
+
+                        # Derive the position from the frame counter instead of
+                        # querying the capture for every frame
+                        frame_number = self._frame_idx
+                        self._frame_idx += 1
+                        if self.fps > 0:
+                            position_ms = int(frame_number * 1000 / self.fps)
+                        else:
+                            position_ms = int(self.cap.get(cv2.CAP_PROP_POS_MSEC))
+                        frames.append((frame, position_ms, frame_number))
+
+                if not frames:
+                    # End of video
+                    self.playback_finished.emit()
+                    break
+
+                # Run inference if enabled, one model call for the whole batch
+                if inference_active:
+                    if batch_size == 1:
+                        results_list = [self.inference_engine.predict(frames[0][0])]
+                    else:
+                        results_list = self.inference_engine.predict_batch([f[0] for f in frames])
+                    frames = [
+                        (self.inference_engine.draw_results(frame, results), position_ms, frame_number)
+                        for (frame, position_ms, frame_number), results in zip(frames, results_list)
+                    ]
+
+                # Convert frames to QImage
+                for frame, position_ms, frame_number in frames:
+                    if display_slot is not None and frame is display_slot[0]:
+                        # Hand out the decoded pixels without copying them
+                        qt_image = self._wrap_display_slot(display_slot)
+                    else:
+                        qt_image = self._convert_frame_to_qimage(frame)
+                    pending.append((qt_image, position_ms, frame_number))
+
+            qt_image, position_ms, self.current_frame_number = pending.popleft()
             if qt_image:
                 self.frame_ready.emit(qt_image)
 
             # Update position signal using captured values
             self.position_changed.emit(position_ms, self.current_frame_number)
 
-            # Control playback speed (basic timing)
-            if self.fps > 0:
-                delay_ms = int(1000 / self.fps)
-                self.msleep(delay_ms)
+            # Control playback speed: sleep until the next frame is due
+            if frame_interval > 0:
+                clock_frames += 1
+                delay = clock_start + clock_frames * frame_interval - time.monotonic()
+                if delay > 0:
+                    self.msleep(int(delay * 1000))
 
-        # Cleanup
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        # Cleanup (under the mutex: the GUI thread reads the capture and the
+        # scrub cache in get_frame_at_position)
+        with QMutexLocker(self.mutex):
+            if self.cap:
+                self.cap.release()
+                self.cap = None
+            self._clear_scrub_cache()
+        self._frame_buf = None
+        # QImages still queued to the GUI keep their buffers alive on their own
+        self._display_slots = []
         self.is_playing = False
 
     def play(self):
@@ -285,13 +411,30 @@ class VideoThread(QThread):
                 self.cap.set(cv2.CAP_PROP_POS_MSEC, position_ms)
                 frame_number = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
 
-            # Read frame without advancing position
-            frame = self._read_frame_at(frame_number)
+            # Scrubbing back and forth revisits the same frames; reuse them
+            # instead of seeking and decoding again. A hit leaves the capture
+            # where it was, which is fine since releasing the slider seeks.
+            frame = self._scrub_cache.get(frame_number) if self.fps > 0 else None
+            if frame is not None:
+                self._scrub_cache.move_to_end(frame_number)
+            else:
+                # Read frame without advancing position
+                frame = self._read_frame_at(frame_number)
+                if frame is not None and self.fps > 0:
+                    self._scrub_cache[frame_number] = frame
+                    self._scrub_cache_bytes += frame.nbytes
+                    # Evict least recently used frames, keeping the newest one
+                    while (self._scrub_cache_bytes > self.SCRUB_CACHE_BYTES
+                           and len(self._scrub_cache) > 1):
+                        _, evicted = self._scrub_cache.popitem(last=False)
+                        self._scrub_cache_bytes -= evicted.nbytes
+
             if frame is not None:
                 # Run inference if enabled
                 if self.inference_engine and self.inference_engine.is_loaded() and self.inference_engine.enabled:
                     results = self.inference_engine.predict(frame)
-                    frame = self.inference_engine.draw_results(frame, results)
+                    # draw_results draws in place; keep the cached frame clean
+                    frame = self.inference_engine.draw_results(frame.copy(), results)
 
                 # Convert and emit frame
                 qt_image = self._convert_frame_to_qimage(frame)
@@ -299,13 +442,88 @@ class VideoThread(QThread):
                     self.frame_ready.emit(qt_image)
 
                 # Update position with frame number
-                position_ms = int(self.cap.get(cv2.CAP_PROP_POS_MSEC))
+                if self.fps > 0:
+                    position_ms = int(frame_number * 1000 / self.fps)
+                else:
+                    position_ms = int(self.cap.get(cv2.CAP_PROP_POS_MSEC))
                 self.position_changed.emit(position_ms, frame_number)
 
                 # Update our tracked frame number if paused (for subsequent steps)
                 if self.is_paused:
                     self.current_frame_number = frame_number
 
+    def _clear_scrub_cache(self):
+        """Drop all cached scrub frames (caller holds self.mutex)"""
+        self._scrub_cache.clear()
+        self._scrub_cache_bytes = 0
+
+    def _acquire_display_slot(self):
+        """
+        Get a display buffer that is safe to decode into.
+
+        Each QImage handed out for a slot wraps its own memoryview of the
+        buffer, and every copy of that QImage (e.g. the one queued to the GUI)
+        keeps the memoryview alive. A slot is free once its last memoryview is
+        gone, i.e. the GUI has released all images showing it.
+
+        Returns:
+            [buffer, weakref] slot, or None if all slots are still in use
+        """
+        for slot in self._display_slots:
+            if slot[1] is None or slot[1]() is None:
+                return slot
+        return None
+
+    @staticmethod
+    def _wrap_display_slot(slot) -> QImage:
+        """
+        Wrap a display slot's buffer in a QImage without copying it
+
+        Args:
+            slot: [buffer, weakref] pair from _acquire_display_slot
+
+        Returns:
+            QImage sharing the slot's pixels
+        """
+        buf = slot[0]
+        height, width = buf.shape[:2]
+        view = memoryview(buf)
+        slot[1] = weakref.ref(view)
+        return QImage(view, width, height, 3 * width, QImage.Format_BGR888)
+
+    @staticmethod
+    def _open_capture(video_path: str) -> cv2.VideoCapture:
+        """
+        Open a video, preferring FFmpeg with hardware-accelerated decoding.
+
+        Falls back to the default backend if hardware decoding is unavailable.
+
+        Args:
+            video_path: Path to the video file
+
+        Returns:
+            VideoCapture object (check isOpened() for success)
+        """
+        if hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            # No CAP_PROP_HW_DEVICE: with ANY, FFmpeg refuses any device index
+            # and the open fails ("Invalid usage of CAP_PROP_HW_DEVICE with
+            # 'ANY' H/W acceleration. Bailout" from cap_ffmpeg_impl.hpp)
+            cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+            ])
+            if cap.isOpened():
+                # Report the acceleration actually in use (NONE when FFmpeg
+                # fell back to software), only when it changes
+                accel = int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+                if accel != VideoThread._reported_hw_acceleration:
+                    VideoThread._reported_hw_acceleration = accel
+                    print(f"Video backend: {cap.getBackendName()} "
+                          f"(hardware acceleration: {_HW_ACCELERATION_NAMES.get(accel, accel)})")
+                return cap
+            cap.release()
+
+        return cv2.VideoCapture(video_path)
+
     def _read_frame_at(self, frame_number: int):
         """
         Read a specific frame without advancing the position.
@@ -317,6 +535,7 @@ class VideoThread(QThread):
             Frame as numpy array, or None if read failed
         """
         self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        self._frame_idx = frame_number
         ret, frame = self.cap.read()
         if ret:
             # Reset position back to the frame we just read
@@ -336,11 +555,12 @@ class VideoThread(QThread):
             QImage or None if conversion fails
         """
         try:
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_frame.shape
+            # Wrap the BGR buffer directly; no separate RGB conversion pass
+            if not frame.flags['C_CONTIGUOUS']:
+                frame = np.ascontiguousarray(frame)
+            h, w, ch = frame.shape
             bytes_per_line = ch * w
-            qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
+            qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_BGR888)
             # Make a copy to avoid issues with the data going out of scope
             return qt_image.copy()
         except Exception as e:
@@ -6,6 +6,29 @@ import os
 from typing import List, Tuple
 from pathlib import Path
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy parser is used instead
+    njit = None
+
+
+# Label files at least this large are parsed with the compiled parser
+# (when numba is installed); smaller files aren't worth the call overhead
+COMPILED_PARSE_MIN_BYTES = 64 * 1024
+
+
+def format_coords(points: np.ndarray) -> str:
+    """
+    Format an (N, 2) array of points as 'x1 y1 x2 y2 ...' with 6 decimals.
+
+    Builds a single format string so all values are formatted in one call
+    instead of one f-string per vertex.
+    """
+    flat = np.asarray(points, dtype=np.float64).ravel().tolist()
+    return ' '.join(['%.6f'] * len(flat)) % tuple(flat)
+
 
 class YOLOAnnotation:
     """Represents a single YOLO annotation (polygon)"""
@@ -14,15 +37,16 @@ class YOLOAnnotation:
         """
         Args:
             class_id: Integer class ID
-            points: List of (x, y) tuples in normalized coordinates (0-1)
+            points: Sequence of (x, y) pairs or an (N, 2) array in normalized
+                coordinates (0-1)
         """
         self.class_id = class_id
-        self.points = points  # Normalized coordinates
+        # Normalized coordinates, stored as an (N, 2) array
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
 
     def to_yolo_string(self) -> str:
         """Convert annotation to YOLO format string"""
-        coords = ' '.join(f'{x:.6f} {y:.6f}' for x, y in self.points)
-        return f'{self.class_id} {coords}'
+        return f'{self.class_id} {format_coords(self.points)}'
 
     @staticmethod
     def from_yolo_string(line: str) -> 'YOLOAnnotation':
@@ -32,23 +56,28 @@ class YOLOAnnotation:
             raise ValueError(f"Invalid YOLO format: {line}")
 
         class_id = int(parts[0])
-        coords = [float(x) for x in parts[1:]]
+        # NumPy converts all values in C and raises ValueError on bad input
+        coords = np.array(parts[1:], dtype=np.float64)
 
         if len(coords) % 2 != 0:
             raise ValueError(f"Odd number of coordinates: {line}")
 
-        points = [(coords[i], coords[i + 1]) for i in range(0, len(coords), 2)]
-        return YOLOAnnotation(class_id, points)
+        return YOLOAnnotation(class_id, coords.reshape(-1, 2))
+
+    def to_point_list(self) -> List[Tuple[float, float]]:
+        """Get the normalized points as a list of (x, y) tuples"""
+        return [(x, y) for x, y in self.points.tolist()]
 
-    def to_pixel_coords(self, img_width: int, img_height: int) -> List[Tuple[float, float]]:
-        """Convert normalized coordinates to pixel coordinates"""
-        return [(x * img_width, y * img_height) for x, y in self.points]
+    def to_pixel_coords(self, img_width: int, img_height: int) -> np.ndarray:
+        """Convert normalized coordinates to an (N, 2) array of pixel coordinates"""
+        return self.points * np.array([img_width, img_height], dtype=np.float64)
 
     @staticmethod
     def from_pixel_coords(class_id: int, pixel_points: List[Tuple[float, float]],
                          img_width: int, img_height: int) -> 'YOLOAnnotation':
         """Create annotation from pixel coordinates"""
-        normalized_points = [(x / img_width, y / img_height) for x, y in pixel_points]
+        pixel_array = np.asarray(pixel_points, dtype=np.float64).reshape(-1, 2)
+        normalized_points = pixel_array / np.array([img_width, img_height], dtype=np.float64)
         return YOLOAnnotation(class_id, normalized_points)
 
 
@@ -65,16 +94,169 @@ def load_annotations(annotation_path: str) -> List[YOLOAnnotation]:
     if not os.path.exists(annotation_path):
         return []
 
-    annotations = []
+    if _parse_label_buffer is not None and os.path.getsize(annotation_path) >= COMPILED_PARSE_MIN_BYTES:
+        return _load_annotations_compiled(annotation_path)
+
+    # Read the whole file in one call; each line's coordinates are then
+    # converted in bulk by NumPy in from_yolo_string
     with open(annotation_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line:  # Skip empty lines
-                try:
-                    annotation = YOLOAnnotation.from_yolo_string(line)
-                    annotations.append(annotation)
-                except ValueError as e:
-                    print(f"Warning: Skipping invalid line in {annotation_path}: {e}")
+        lines = f.read().splitlines()
+
+    annotations = []
+    for line in lines:
+        line = line.strip()
+        if line:  # Skip empty lines
+            try:
+                annotation = YOLOAnnotation.from_yolo_string(line)
+                annotations.append(annotation)
+            except ValueError as e:
+                print(f"Warning: Skipping invalid line in {annotation_path}: {e}")
+
+    return annotations
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _parse_label_buffer(buf):
+        """
+        Parse the raw bytes of a label file into floats in one compiled pass.
+
+        Returns:
+            values: All parsed numbers, in order
+            value_starts: Offset of each line's first value in values (n_lines + 1 entries)
+            byte_starts, byte_ends: Byte range of each line in buf
+            line_ok: False for lines with a malformed number, a non-integer class ID
+                or a number that can't be converted exactly (see below)
+        """
+        n = buf.shape[0]
+        n_lines = 1
+        for i in range(n):
+            if buf[i] == 10:
+                n_lines += 1
+
+        values = np.empty(n // 2 + 1, dtype=np.float64)
+        value_starts = np.zeros(n_lines + 1, dtype=np.int64)
+        byte_starts = np.zeros(n_lines, dtype=np.int64)
+        byte_ends = np.zeros(n_lines, dtype=np.int64)
+        line_ok = np.ones(n_lines, dtype=np.bool_)
+
+        nv = 0
+        line = 0
+        i = 0
+        while i < n:
+            c = buf[i]
+            if c == 10:  # '\n'
+                byte_ends[line] = i
+                line += 1
+                value_starts[line] = nv
+                byte_starts[line] = i + 1
+                i += 1
+                continue
+            if c == 32 or c == 9 or c == 13:  # ' ', '\t', '\r'
+                i += 1
+                continue
+
+            first_token = nv == value_starts[line]
+            negative = False
+            if c == 45 or c == 43:  # '-', '+'
+                negative = c == 45
+                i += 1
+
+            mantissa = 0.0
+            digits = 0
+            frac_digits = 0
+            seen_dot = False
+            while i < n:
+                c = buf[i]
+                if 48 <= c <= 57:
+                    mantissa = mantissa * 10.0 + (c - 48)
+                    digits += 1
+                    if seen_dot:
+                        frac_digits += 1
+                elif c == 46 and not seen_dot:  # '.'
+                    seen_dot = True
+                else:
+                    break
+                i += 1
+
+            exponent = 0
+            has_exponent = False
+            if i < n and digits > 0 and (buf[i] == 101 or buf[i] == 69):  # 'e', 'E'
+                has_exponent = True
+                i += 1
+                exp_negative = False
+                if i < n and (buf[i] == 45 or buf[i] == 43):
+                    exp_negative = buf[i] == 45
+                    i += 1
+                exp_digits = 0
+                while i < n and 48 <= buf[i] <= 57:
+                    exponent = exponent * 10 + (buf[i] - 48)
+                    exp_digits += 1
+                    i += 1
+                if exp_digits == 0:
+                    line_ok[line] = False
+                if exp_negative:
+                    exponent = -exponent
+
+            # A number must be followed by whitespace or the end of the buffer
+            if digits == 0 or (i < n and buf[i] != 32 and buf[i] != 9 and buf[i] != 13 and buf[i] != 10):
+                line_ok[line] = False
+                while i < n and buf[i] != 32 and buf[i] != 9 and buf[i] != 13 and buf[i] != 10:
+                    i += 1
+            if first_token and (seen_dot or has_exponent):
+                line_ok[line] = False
+
+            # mantissa and 10**k are exact doubles while digits <= 15 and
+            # k <= 22, so a single multiply or divide is correctly rounded
+            # (the same value float() gives). Anything beyond that goes to
+            # the fallback parser.
+            scale = exponent - frac_digits
+            if digits > 15 or scale > 22 or scale < -22:
+                line_ok[line] = False
+                value = 0.0
+            elif scale >= 0:
+                value = mantissa * 10.0 ** scale
+            else:
+                value = mantissa / 10.0 ** -scale
+            values[nv] = -value if negative else value
+            nv += 1
+
+        byte_ends[line] = n
+        value_starts[line + 1] = nv
+        return values[:nv], value_starts[:line + 2], byte_starts[:line + 1], byte_ends[:line + 1], line_ok[:line + 1]
+else:
+    _parse_label_buffer = None
+
+
+def _load_annotations_compiled(annotation_path: str) -> List[YOLOAnnotation]:
+    """
+    Load annotations using the compiled parser (see _parse_label_buffer).
+
+    Lines the compiled parser can't handle are re-parsed with
+    YOLOAnnotation.from_yolo_string so errors are reported the same way.
+    """
+    with open(annotation_path, 'rb') as f:
+        data = f.read()
+
+    values, value_starts, byte_starts, byte_ends, line_ok = _parse_label_buffer(
+        np.frombuffer(data, dtype=np.uint8))
+
+    annotations = []
+    for i in range(len(line_ok)):
+        start = value_starts[i]
+        count = value_starts[i + 1] - start
+        if count == 0 and line_ok[i]:  # Skip empty lines
+            continue
+
+        if line_ok[i] and count >= 3 and count % 2 == 1:
+            annotations.append(YOLOAnnotation(int(values[start]), values[start + 1:start + count]))
+            continue
+
+        line = data[byte_starts[i]:byte_ends[i]].decode(errors='replace').strip()
+        try:
+            annotations.append(YOLOAnnotation.from_yolo_string(line))
+        except ValueError as e:
+            print(f"Warning: Skipping invalid line in {annotation_path}: {e}")
 
     return annotations
 
@@ -96,9 +278,10 @@ def save_annotations(annotation_path: str, annotations: List[YOLOAnnotation]) ->
     # Create directory if it doesn't exist
     os.makedirs(os.path.dirname(annotation_path), exist_ok=True)
 
+    # Build the whole file first and write it in one call
+    payload = '\n'.join(annotation.to_yolo_string() for annotation in annotations) + '\n'
     with open(annotation_path, 'w') as f:
-        for annotation in annotations:
-            f.write(annotation.to_yolo_string() + '\n')
+        f.write(payload)
 
 
 def get_annotation_path(image_path: str, labels_dir: str) -> str:
@@ -145,8 +328,7 @@ def convert_results_to_yolo_strings(results) -> List[str]:
 
             for class_id, polygon in zip(class_ids, normalized_polygons):
                 # Ensure the polygon points are flat list of coordinates (x1 y1 x2 y2 ...)
-                coords = ' '.join(f'{x:.6f} {y:.6f}' for x, y in polygon)
-                yolo_strings.append(f'{class_id} {coords}')
+                yolo_strings.append(f'{class_id} {format_coords(polygon)}')
         except Exception as e:
             # Handle cases where results object structure is unexpected
             print(f"Error processing ultralytics results for YOLO conversion: {e}")
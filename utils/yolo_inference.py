@@ -1,8 +1,40 @@
 """
 YOLO model inference utilities.
 """
+import os
+import sys
+import threading
+import cv2
 import numpy as np
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+
+# Let PyTorch's CUDA caching allocator grow segments in place instead of
+# fragmenting over long sessions. Must be set before torch is first imported
+# (torch/ultralytics are imported lazily on model load). Not supported on
+# Windows; an existing PYTORCH_CUDA_ALLOC_CONF always wins.
+if sys.platform != "win32":
+    os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
+# BGR colors cycled by class ID when drawing results
+CLASS_COLORS = [
+    (56, 56, 255), (151, 157, 255), (31, 112, 255), (29, 178, 255),
+    (49, 210, 207), (10, 249, 72), (23, 204, 146), (134, 219, 61),
+    (52, 147, 26), (187, 212, 0), (168, 153, 44), (255, 194, 0),
+    (147, 69, 52), (255, 115, 100), (236, 24, 0), (255, 56, 132),
+]
+
+# Opacity of filled segmentation masks
+MASK_ALPHA = 0.4
+
+# Square input size used for warm-up inference
+WARMUP_IMGSZ = 640
+
+# Dummy inferences run after loading on a CUDA GPU; the first pays for
+# CUDA/cuDNN setup, the following ones settle allocator pools and autotuned
+# kernels (on CPU a single run is enough)
+WARMUP_RUNS = 3
 
 
 class YOLOInference:
@@ -14,13 +46,24 @@ class YOLOInference:
         self.active_slot = 0 # Currently active slot
         self.confidence = 0.5
         self.enabled = True
+        self.half_precision = True  # Run FP16 inference when a CUDA GPU is available
+        self.batch_size = 1  # Frames per model call during playback (1 = lowest latency)
+        # Reused scratch image for mask blending, one per thread: playback
+        # and GUI-thread seeks/steps can draw at the same time
+        self._overlay = threading.local()
+        # Single worker so background model loads run one at a time
+        self._load_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-load")
+        self._use_half = False
 
     def load_model(self, path: str, slot_index: int = 0) -> bool:
         """
-        Load a YOLO model from .pt file into a specific slot
+        Load a YOLO model into a specific slot.
+
+        Exported TensorRT (.engine) and ONNX (.onnx) models are loaded
+        directly by ultralytics without conversion.
 
         Args:
-            path: Path to .pt model file
+            path: Path to .pt, .engine or .onnx model file
             slot_index: Index of the slot (e.g., 0 or 1)
 
         Returns:
@@ -29,8 +72,15 @@ class YOLOInference:
         try:
             from ultralytics import YOLO
             model = YOLO(path)
+            cuda = self._cuda_available()
+            use_half = self.half_precision and cuda
+            # Warm up before publishing the model: this may run on the loader
+            # thread, and playback must not call predict() on it concurrently.
+            # Only GPUs have kernel selection and pools to settle after the first run.
+            self._warmup(model, use_half, WARMUP_RUNS if cuda else 1)
             self.models[slot_index] = model
             self.item_paths[slot_index] = path
+            self._use_half = use_half
             
             # If this is the only model or we are loading into the active slot, it's ready.
             # But we don't necessarily force switch unless requested. 
@@ -45,6 +95,50 @@ class YOLOInference:
                 del self.item_paths[slot_index]
             return False
 
+    def _warmup(self, model, use_half: bool, runs: int = WARMUP_RUNS):
+        """
+        Run dummy inferences so CUDA context creation, cuDNN kernel
+        selection and lazy initialization happen at load time instead of
+        on the first played frames.
+
+        Args:
+            model: Freshly loaded YOLO model
+            use_half: Whether inference will run in FP16
+            runs: Number of dummy inferences to run
+        """
+        try:
+            import torch
+            # Let cuDNN pick the fastest kernels for the (fixed) input size
+            torch.backends.cudnn.benchmark = True
+        except ImportError:
+            pass
+
+        try:
+            dummy = np.zeros((WARMUP_IMGSZ, WARMUP_IMGSZ, 3), dtype=np.uint8)
+            for _ in range(runs):
+                model(dummy, conf=self.confidence, half=use_half, verbose=False)
+        except Exception as e:
+            print(f"Warning: model warm-up failed: {e}")
+
+    def load_model_async(self, path: str, slot_index: int = 0,
+                         on_done: Optional[Callable[[bool], None]] = None) -> Future:
+        """
+        Load a YOLO model on a background thread (see load_model)
+
+        Args:
+            path: Path to model file
+            slot_index: Index of the slot (e.g., 0 or 1)
+            on_done: Called with the load result when finished. It runs on the
+                worker thread, so GUI code should forward it through a signal.
+
+        Returns:
+            Future resolving to True if loaded successfully, False otherwise
+        """
+        future = self._load_executor.submit(self.load_model, path, slot_index)
+        if on_done is not None:
+            future.add_done_callback(lambda f: on_done(f.result()))
+        return future
+
     def unload_model(self, slot_index: int = 0):
         """Unload the model from a specific slot"""
         if slot_index in self.models:
@@ -74,18 +168,46 @@ class YOLOInference:
             return None
 
         try:
-            results = model(frame, conf=self.confidence, verbose=False)
+            results = model(frame, conf=self.confidence, half=self._use_half, verbose=False)
             return results[0] if results else None
         except Exception as e:
             print(f"Error during inference: {e}")
             return None
 
+    def predict_batch(self, frames: List[np.ndarray]) -> list:
+        """
+        Run inference on several frames in a single model call
+
+        Args:
+            frames: Input frames (numpy arrays in BGR format from OpenCV)
+
+        Returns:
+            List with one Results object (or None) per input frame
+        """
+        if not self.enabled:
+            return [None] * len(frames)
+
+        model = self.models.get(self.active_slot)
+        if model is None:
+            return [None] * len(frames)
+
+        try:
+            results = model(frames, conf=self.confidence, half=self._use_half, verbose=False)
+            return list(results) if results else [None] * len(frames)
+        except Exception as e:
+            print(f"Error during batch inference: {e}")
+            return [None] * len(frames)
+
     def draw_results(self, frame: np.ndarray, results) -> np.ndarray:
         """
         Draw bounding boxes, labels, confidence scores, and masks on frame
 
+        Detection and segmentation results are drawn in place with OpenCV.
+        Other result types (classification, pose, OBB) fall back to the
+        ultralytics plotter.
+
         Args:
-            frame: Input frame
+            frame: Input frame (modified in place for boxes/masks)
             results: Results object from predict()
 
         Returns:
@@ -95,9 +217,45 @@ class YOLOInference:
             return frame
 
         try:
-            # Use ultralytics built-in plotting
-            annotated_frame = results.plot()
-            return annotated_frame
+            boxes = results.boxes
+            if boxes is None or results.keypoints is not None or results.obb is not None:
+                # Use ultralytics built-in plotting
+                return results.plot()
+
+            if len(boxes) == 0:
+                return frame
+
+            # Plain Python ints/floats, as OpenCV drawing calls expect
+            xyxy = boxes.xyxy.cpu().numpy().astype(np.int32).tolist()
+            class_ids = boxes.cls.cpu().numpy().astype(np.int32).tolist()
+            confidences = boxes.conf.cpu().numpy().tolist()
+            names = results.names
+
+            # Fill masks on a copy of the frame, then blend once
+            if results.masks is not None:
+                overlay = getattr(self._overlay, 'buf', None)
+                if overlay is None or overlay.shape != frame.shape:
+                    overlay = self._overlay.buf = np.empty_like(frame)
+                np.copyto(overlay, frame)
+                for polygon, class_id in zip(results.masks.xy, class_ids):
+                    if len(polygon):
+                        color = CLASS_COLORS[class_id % len(CLASS_COLORS)]
+                        cv2.fillPoly(overlay, [polygon.astype(np.int32)], color)
+                cv2.addWeighted(overlay, MASK_ALPHA, frame, 1.0 - MASK_ALPHA, 0, dst=frame)
+
+            # Boxes and labels
+            for (x1, y1, x2, y2), class_id, confidence in zip(xyxy, class_ids, confidences):
+                color = CLASS_COLORS[class_id % len(CLASS_COLORS)]
+                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+
+                label = f"{names.get(class_id, class_id)} {confidence:.2f}"
+                (text_w, text_h), baseline = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                text_top = max(y1 - text_h - baseline, 0)
+                cv2.rectangle(frame, (x1, text_top), (x1 + text_w, text_top + text_h + baseline), color, -1)
+                cv2.putText(frame, label, (x1, text_top + text_h), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.5, (255, 255, 255), 1, cv2.LINE_AA)
+
+            return frame
         except Exception as e:
             print(f"Error drawing results: {e}")
             return frame
@@ -120,6 +278,34 @@ class YOLOInference:
         """
         self.enabled = enabled
 
+    def set_batch_size(self, batch_size: int):
+        """
+        Set how many playback frames are sent to the model per call
+
+        Args:
+            batch_size: Frames per batch (1 disables batching)
+        """
+        self.batch_size = max(1, int(batch_size))
+
+    def set_half_precision(self, enabled: bool):
+        """
+        Enable or disable FP16 inference (only takes effect on CUDA GPUs)
+
+        Args:
+            enabled: True to use FP16 when possible, False to force FP32
+        """
+        self.half_precision = enabled
+        self._use_half = enabled and self._cuda_available()
+
+    @staticmethod
+    def _cuda_available() -> bool:
+        """Check whether PyTorch can see a CUDA device"""
+        try:
+            import torch
+            return torch.cuda.is_available()
+        except ImportError:
+            return False
+
     def is_loaded(self, slot_index: Optional[int] = None) -> bool:
         """
         Check if a model is loaded. 
@@ -1,6 +1,7 @@
 """
 Image canvas widget for displaying and annotating images.
 """
+import io
 from typing import List, Optional, Tuple
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QGraphicsPolygonItem, QGraphicsEllipseItem
 from PySide6.QtCore import Qt, Signal, QPointF, QRectF
@@ -61,11 +62,18 @@ class ImageCanvas(QGraphicsView):
         self.temp_polygon_item: Optional[QGraphicsPolygonItem] = None
         self.temp_vertex_items: List[QGraphicsEllipseItem] = []
 
-    def load_image(self, image_path: str) -> bool:
-        """Load an image from file path"""
+    def load_image(self, image_path: str, image_data: Optional[bytes] = None) -> bool:
+        """
+        Load an image from file path
+
+        Args:
+            image_path: Path to the image file
+            image_data: Already-read file contents (skips reading from disk)
+        """
         try:
             # Load image using PIL to handle various formats
-            pil_image = Image.open(image_path)
+            source = io.BytesIO(image_data) if image_data is not None else image_path
+            pil_image = Image.open(source)
             pil_image = pil_image.convert('RGB')
 
             # Convert PIL image to QPixmap
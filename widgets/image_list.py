@@ -3,10 +3,12 @@ Image list widget with optimized performance for large datasets.
 """
 import os
 from pathlib import Path
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QListView, QAbstractItemView,
                                 QLabel, QLineEdit, QHBoxLayout)
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QPalette
+from PySide6.QtCore import (Qt, Signal, QStringListModel, QSortFilterProxyModel,
+                            QItemSelectionModel)
+
+from widgets.selection_delegate import SelectionColorDelegate
 
 
 class ImageListWidget(QWidget):
@@ -48,14 +50,25 @@ class ImageListWidget(QWidget):
         self.count_label.setStyleSheet("color: gray; font-size: 9pt;")
         layout.addWidget(self.count_label)
 
-        # Image list
-        self.list_widget = QListWidget()
-        self.list_widget.setSpacing(2)
-        self.list_widget.itemClicked.connect(self._on_item_clicked)
-        self.list_widget.setVerticalScrollMode(QListWidget.ScrollPerPixel)
-        self.list_widget.setStyleSheet("QListWidget::item:selected { background-color: #1e90ff; color: white; }")
-
-        layout.addWidget(self.list_widget)
+        # Image list (model/view: rows are drawn on demand from the string
+        # model, no per-image item objects are created)
+        self.model = QStringListModel(self)
+        # Filtering runs natively in the proxy (case-insensitive substring)
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy_model)
+        self.list_view.setSpacing(2)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.clicked.connect(self._on_item_clicked)
+        self.list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        # Selected rows are painted by a delegate rather than a style sheet,
+        # so rows are drawn by the native style without QSS matching
+        self.list_view.setItemDelegate(SelectionColorDelegate(parent=self.list_view))
+
+        layout.addWidget(self.list_view)
 
     def set_images(self, images_dir, image_files):
         """
@@ -69,43 +82,30 @@ class ImageListWidget(QWidget):
         self.image_files = image_files
         self.current_index = -1
 
-        # Clear existing items
-        self.list_widget.clear()
+        # Clear existing filter
         self.filter_input.clear()
 
         # Update count
         self.count_label.setText(f"{len(image_files)} images")
 
-        # Add items with just filenames (instant even with 10000+ images)
-        for i, filename in enumerate(image_files):
-            item = QListWidgetItem(filename)
-            item.setData(Qt.UserRole, i)  # Store original index
-            self.list_widget.addItem(item)
+        # Replace the model contents in one reset; row == original index
+        self.model.setStringList(image_files)
 
     def _filter_images(self, text):
         """Filter image list based on search text"""
-        search_text = text.lower()
-
-        visible_count = 0
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item:
-                filename = item.text().lower()
-                matches = search_text in filename
-                item.setHidden(not matches)
-                if matches:
-                    visible_count += 1
+        self.proxy_model.setFilterFixedString(text)
 
         # Update count label
-        if search_text:
+        if text:
+            visible_count = self.proxy_model.rowCount()
             self.count_label.setText(f"{visible_count} of {len(self.image_files)} images")
         else:
             self.count_label.setText(f"{len(self.image_files)} images")
 
-    def _on_item_clicked(self, item):
+    def _on_item_clicked(self, proxy_index):
         """Handle item click event"""
-        index = item.data(Qt.UserRole)
-        self.image_selected.emit(index)
+        # Source rows match the original image indices
+        self.image_selected.emit(self.proxy_model.mapToSource(proxy_index).row())
 
     def set_current_image(self, index):
         """
@@ -116,20 +116,19 @@ class ImageListWidget(QWidget):
         """
         self.current_index = index
 
-        # Clear previous selection
-        self.list_widget.clearSelection()
+        # Source rows match image indices; map the row through the filter
+        proxy_index = self.proxy_model.mapFromSource(self.model.index(index))
+        if not proxy_index.isValid():
+            # Out of range or filtered out
+            self.list_view.clearSelection()
+            return
 
-        # Find and select the item with this index
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item and item.data(Qt.UserRole) == index:
-                item.setSelected(True)
-                self.list_widget.scrollToItem(item, QListWidget.PositionAtCenter)
-                break
+        self.list_view.selectionModel().select(proxy_index, QItemSelectionModel.ClearAndSelect)
+        self.list_view.scrollTo(proxy_index, QListView.PositionAtCenter)
 
     def clear(self):
         """Clear the image list"""
-        self.list_widget.clear()
+        self.model.setStringList([])
         self.image_files = []
         self.images_dir = None
         self.current_index = -1
@@ -0,0 +1,35 @@
+"""
+Item delegate that paints selected rows in a fixed color.
+"""
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
+from PySide6.QtGui import QColor, QPalette
+
+
+class SelectionColorDelegate(QStyledItemDelegate):
+    """
+    Paints selected rows with a solid background and text color
+
+    Native styles (e.g. Windows) draw the selection themselves and ignore the
+    palette's Highlight colors, so the delegate fills the row and then draws
+    the item as unselected on top of it.
+    """
+
+    def __init__(self, background="#1e90ff", text="white", parent=None):
+        super().__init__(parent)
+        self._background = QColor(background)
+        self._text = QColor(text)
+
+    def paint(self, painter, option, index):
+        if not option.state & QStyle.State_Selected:
+            super().paint(painter, option, index)
+            return
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        painter.fillRect(opt.rect, self._background)
+
+        # Let the style draw only the text (and icon), not its own selection
+        opt.state &= ~(QStyle.State_Selected | QStyle.State_MouseOver | QStyle.State_HasFocus)
+        opt.palette.setColor(QPalette.Text, self._text)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
@@ -2,24 +2,51 @@
 Video inference tab widget.
 """
 import os
+from dataclasses import dataclass, fields
+from typing import List, Optional
 from PySide6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QPushButton,
                                 QLabel, QSlider, QCheckBox, QFileDialog, QMessageBox, QApplication,
-                                QRadioButton, QButtonGroup, QSplitter, QSizePolicy)
-from PySide6.QtCore import Qt, QByteArray
+                                QRadioButton, QButtonGroup, QSplitter, QSizePolicy,
+                                QProgressDialog, QSpinBox)
+from PySide6.QtCore import Qt, QByteArray, Signal, QTimer
 
 from widgets.video_list import VideoListWidget
 from widgets.video_player import VideoPlayerWidget
 from utils.video_handler import VideoHandler
 from utils.yolo_inference import YOLOInference
 from utils.video_thread import VideoThread
+from utils.frame_exporter import FrameExportWorker
 
-import cv2
-from utils.yolo_format import convert_results_to_yolo_strings
+
+@dataclass(slots=True)
+class VideoTabSessionState:
+    """Video tab state as stored in a session file (see get_session_state)"""
+
+    video_folder: Optional[str] = None
+    video_files: Optional[List[str]] = None
+    video_folder_mtime_ns: Optional[int] = None
+    model_paths: Optional[dict] = None
+    model_path: Optional[str] = None  # Legacy single-model sessions
+    active_model_slot: int = 0
+    inference_threshold: float = 0.5
+    inference_enabled: bool = True
+    inference_batch_size: int = 1
+    current_video_index: int = 0
+    export_output_dir: Optional[str] = None
+    splitter_state: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VideoTabSessionState":
+        """Build from session data; missing keys keep their defaults, unknown keys are ignored"""
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
 
 
 class VideoInferenceTab(QWidget):
     """Main tab for video inference"""
 
+    # Emitted from the model loading thread: (slot_index, model_path, success)
+    model_load_finished = Signal(int, str, bool)
+
     def __init__(self):
         super().__init__()
 
@@ -28,6 +55,7 @@ class VideoInferenceTab(QWidget):
         self.inference_engine = YOLOInference()
         self.video_thread = None
         self.export_output_dir = None
+        self.export_worker = FrameExportWorker()
 
         self._setup_ui()
         self._setup_connections()
@@ -158,6 +186,18 @@ class VideoInferenceTab(QWidget):
         self.confidence_value_label.setAlignment(Qt.AlignCenter)
         right_layout.addWidget(self.confidence_value_label)
 
+        # Frames per model call during playback; larger batches raise GPU
+        # throughput at the cost of latency
+        batch_layout = QHBoxLayout()
+        batch_layout.addWidget(QLabel("Inference Batch Size:"))
+        self.batch_size_spin = QSpinBox()
+        self.batch_size_spin.setRange(1, 16)
+        self.batch_size_spin.setValue(1)
+        self.batch_size_spin.setToolTip("Frames sent to the model per call during playback (1 = lowest latency)")
+        self.batch_size_spin.valueChanged.connect(self._on_batch_size_changed)
+        batch_layout.addWidget(self.batch_size_spin)
+        right_layout.addLayout(batch_layout)
+
         right_layout.addSpacing(20)
 
         # Inference toggle
@@ -208,6 +248,20 @@ class VideoInferenceTab(QWidget):
         self.export_status_label.setAlignment(Qt.AlignCenter)
         right_layout.addWidget(self.export_status_label)
 
+        # Throttles slider previews: at most one frame request per interval,
+        # always for the latest slider position
+        self._pending_seek_ms = None
+        self._seek_timer = QTimer(self)
+        self._seek_timer.setSingleShot(True)
+        self._seek_timer.setInterval(30)
+        self._seek_timer.timeout.connect(self._apply_pending_seek)
+
+        # Drops the "Saved ..." line from the status label a while after an export
+        self._export_status_timer = QTimer(self)
+        self._export_status_timer.setSingleShot(True)
+        self._export_status_timer.setInterval(3000)
+        self._export_status_timer.timeout.connect(self._update_export_counts)
+
         right_layout.addStretch()
 
         right_panel.setMaximumWidth(350)
@@ -230,6 +284,11 @@ class VideoInferenceTab(QWidget):
         # Export signal
         self.export_button.clicked.connect(self.on_export_frame)
 
+        self.export_worker.export_finished.connect(self._on_export_finished)
+
+        # Background model loading
+        self.model_load_finished.connect(self._on_model_load_finished)
+
     def select_video_folder(self):
         """Open dialog to select video folder"""
         folder = QFileDialog.getExistingDirectory(self, "Select Video Folder")
@@ -277,18 +336,36 @@ class VideoInferenceTab(QWidget):
             self,
             f"Select YOLO Model for Slot {slot_index + 1}",
             "",
-            "YOLO Models (*.pt)"
+            "YOLO Models (*.pt *.engine *.onnx)"
         )
 
         if model_path:
-            success = self.inference_engine.load_model(model_path, slot_index)
-            if success:
-                label = self.model1_path_label if slot_index == 0 else self.model2_path_label
-                label.setText(model_path)
-                label.setStyleSheet("color: black;")
-                QMessageBox.information(self, "Success", f"Model loaded successfully into Slot {slot_index + 1}!")
-            else:
-                QMessageBox.critical(self, "Error", "Failed to load model. Please check the file.")
+            # Load on a worker thread so the UI stays responsive
+            label = self.model1_path_label if slot_index == 0 else self.model2_path_label
+            label.setText(f"Loading and warming up {model_path}...")
+            label.setStyleSheet("color: gray;")
+            self.inference_engine.load_model_async(
+                model_path, slot_index,
+                lambda success: self.model_load_finished.emit(slot_index, model_path, success)
+            )
+
+    def _on_model_load_finished(self, slot_index, model_path, success):
+        """Handle completion of a background model load"""
+        label = self.model1_path_label if slot_index == 0 else self.model2_path_label
+        if success:
+            label.setText(model_path)
+            label.setStyleSheet("color: black;")
+            QMessageBox.information(self, "Success", f"Model loaded successfully into Slot {slot_index + 1}!")
+        else:
+            label.setText("Not loaded")
+            label.setStyleSheet("color: gray;")
+            QMessageBox.critical(self, "Error", "Failed to load model. Please check the file.")
+
+    def _set_model_label(self, slot_index, model_path):
+        """Show a loaded model's path in its slot label"""
+        label = self.model1_path_label if slot_index == 0 else self.model2_path_label
+        label.setText(model_path)
+        label.setStyleSheet("color: black;")
 
     def remove_model(self, slot_index=0):
         """Unload the current model"""
@@ -308,6 +385,7 @@ class VideoInferenceTab(QWidget):
         folder = QFileDialog.getExistingDirectory(self, "Select Export Output Folder")
         if folder:
             self.export_output_dir = folder
+            self.export_worker.forget_directories()
             self.export_path_label.setText(folder)
             self.export_path_label.setStyleSheet("color: black;")
             
@@ -387,9 +465,8 @@ class VideoInferenceTab(QWidget):
 
     def on_video_selected(self, index):
         """Handle video selection from list"""
-        # Stop current playback
-        if self.video_thread and self.video_thread.isRunning():
-            self.video_thread.stop()
+        # Stop current playback and drop the old thread before creating a new one
+        self._release_video_thread()
 
         # Update video handler
         if self.video_handler.goto_video(index):
@@ -415,8 +492,31 @@ class VideoInferenceTab(QWidget):
             self.video_thread.playback_finished.connect(self.video_player.on_playback_finished)
             self.video_thread.error_occurred.connect(self._on_video_error)
 
-            # New signal for export frame data
-            self.video_thread.frame_data_ready_for_export.connect(self._handle_frame_export_data)
+            # New signal for export frame data. Always queued, so the emitter
+            # returns immediately and the frame is handed over by reference
+            # (the signal carries Python objects, no metatype conversion)
+            self.video_thread.frame_data_ready_for_export.connect(
+                self._handle_frame_export_data, Qt.QueuedConnection
+            )
+
+    def _release_video_thread(self):
+        """Stop the current video thread, disconnect its signals and delete it"""
+        thread = self.video_thread
+        if thread is None:
+            return
+
+        # stop() waits for run() to return, so the capture is released
+        thread.stop()
+        for signal in (thread.frame_ready, thread.position_changed,
+                       thread.duration_changed, thread.playback_finished,
+                       thread.error_occurred, thread.frame_data_ready_for_export):
+            try:
+                signal.disconnect()
+            except (RuntimeError, TypeError):
+                pass  # Nothing connected
+
+        thread.deleteLater()
+        self.video_thread = None
 
     def on_play(self):
         """Handle play button"""
@@ -435,6 +535,9 @@ class VideoInferenceTab(QWidget):
 
     def on_seek(self, position_ms):
         """Handle seek request"""
+        # The final position supersedes any preview still waiting
+        self._seek_timer.stop()
+        self._pending_seek_ms = None
         if self.video_thread:
             self.video_thread.seek(position_ms)
 
@@ -450,7 +553,15 @@ class VideoInferenceTab(QWidget):
 
     def on_slider_moved(self, position_ms):
         """Handle slider being moved (preview frame)"""
-        if self.video_thread:
+        self._pending_seek_ms = position_ms
+        if not self._seek_timer.isActive():
+            self._seek_timer.start()
+
+    def _apply_pending_seek(self):
+        """Show the preview frame for the latest slider position"""
+        position_ms = self._pending_seek_ms
+        self._pending_seek_ms = None
+        if position_ms is not None and self.video_thread:
             self.video_thread.get_frame_at_position(position_ms)
 
     def _on_confidence_changed(self, value):
@@ -459,6 +570,10 @@ class VideoInferenceTab(QWidget):
         self.confidence_value_label.setText(f"{confidence:.2f}")
         self.inference_engine.set_confidence(confidence)
 
+    def _on_batch_size_changed(self, value):
+        """Handle batch size spin box change"""
+        self.inference_engine.set_batch_size(value)
+
     def _on_inference_toggled(self, state):
         """Handle inference checkbox toggle"""
         # Fix: state is int (0 or 2), Qt.Checked is enum. Compare values.
@@ -472,63 +587,39 @@ class VideoInferenceTab(QWidget):
     def _handle_frame_export_data(self, frame_np, frame_number, video_name, results):
         """
         Handles the raw frame and inference results received from the video thread
-        and performs file IO to save the image and annotation.
+        and queues them for the export worker, which saves the image and annotation.
         """
         output_dir = self.export_output_dir
         if not output_dir or frame_np is None:
             QMessageBox.critical(self, "Export Error", "Missing output path or frame data.")
             return
 
-        # 1. Define paths and ensure directories exist
         base_name = f"{video_name}_f{frame_number:06d}"
-        
-        images_dir = os.path.join(output_dir, "images")
-        labels_dir = os.path.join(output_dir, "labels")
 
-        os.makedirs(images_dir, exist_ok=True)
-        os.makedirs(labels_dir, exist_ok=True)
+        # Labels are only written for results from an enabled engine. An empty
+        # label file is still created when nothing was detected; when inference
+        # produced no results at all, no label file is created.
+        if not self.inference_engine.enabled:
+            results = None
 
-        image_path = os.path.join(images_dir, f"{base_name}.jpg")
-        label_path = os.path.join(labels_dir, f"{base_name}.txt")
+        if not self.export_worker.submit(output_dir, base_name, frame_np, results):
+            QMessageBox.warning(self, "Export Busy",
+                                "Too many exports are still being written. Please try again.")
 
-        # 2. Save the frame image (frame_np is BGR from OpenCV)
-        try:
-            cv2.imwrite(image_path, frame_np)
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"Failed to save image: {e}")
-            return
-            
-        # 3. Save the YOLO annotation file if inference is enabled and results exist
-        if self.inference_engine.enabled and results is not None:
-            yolo_strings = convert_results_to_yolo_strings(results)
-            
-            if yolo_strings:
-                try:
-                    with open(label_path, 'w') as f:
-                        for line in yolo_strings:
-                            f.write(line + '\n')
-                except Exception as e:
-                    QMessageBox.warning(self, "Export Warning", f"Image saved, but failed to save labels: {e}")
-                    return
-            # If yolo_strings is empty but results is not None, it means no objects were detected.
-            else:
-                 try:
-                    # Create empty file
-                    open(label_path, 'w').close()
-                 except Exception as e:
-                    QMessageBox.warning(self, "Export Warning", f"Image saved, but failed to create empty label file: {e}")
-                    return
-
-        elif self.inference_engine.enabled and results is None:
-            # Inference was enabled but no results were obtained (maybe model failed or no detection)
-            # If no detections, we DO NOT create a label file, as per user request.
-            pass
-        else:
-             pass
-        
-        # 4. Update total export counts
+    def _on_export_finished(self, image_path, success, error):
+        """Handle a finished write from the export worker"""
+        if not success:
+            QMessageBox.critical(self, "Export Error", error)
+
+        # Update total export counts
         self._update_export_counts()
 
+        # Confirm the save in the status label instead of a dialog
+        if success:
+            counts = self.export_status_label.text()
+            self.export_status_label.setText(f"Saved {os.path.basename(image_path)}\n{counts}")
+            self._export_status_timer.start()
+
     def get_session_state(self) -> dict:
         """
         Get current state for session saving.
@@ -538,10 +629,14 @@ class VideoInferenceTab(QWidget):
         """
         return {
             "video_folder": self.video_handler.videos_dir,
+            # Lets restore skip rescanning the folder if it hasn't changed
+            "video_files": self.video_handler.video_files,
+            "video_folder_mtime_ns": self.video_handler.dir_mtime_ns,
             "model_paths": self.inference_engine.item_paths,
             "active_model_slot": self.inference_engine.active_slot,
             "inference_threshold": self.inference_engine.confidence,
             "inference_enabled": self.inference_engine.enabled,
+            "inference_batch_size": self.inference_engine.batch_size,
             "current_video_index": self.video_handler.get_current_index(),
             "export_output_dir": self.export_output_dir,
             "splitter_state": self.splitter.saveState().toBase64().data().decode()
@@ -558,16 +653,33 @@ class VideoInferenceTab(QWidget):
             List of warning messages for paths that don't exist
         """
         warnings = []
+        state = VideoTabSessionState.from_dict(data)
 
         # Stop any current playback
         if self.video_thread and self.video_thread.isRunning():
             self.video_thread.stop()
 
+        video_folder = state.video_folder
+        export_folder = state.export_output_dir
+        model_paths = state.model_paths
+        if not model_paths and state.model_path is not None:
+            # Legacy support
+            model_paths = {0: state.model_path}
+
+        # Check each distinct path once (sessions may live on slow network drives)
+        session_paths = {video_folder, export_folder}
+        if isinstance(model_paths, dict):
+            session_paths.update(model_paths.values())
+        path_exists = {path: os.path.exists(path) for path in session_paths if path}
+
         # Restore video folder
-        video_folder = data.get("video_folder")
         if video_folder:
-            if os.path.exists(video_folder):
-                self.video_handler.set_directory(video_folder)
+            if path_exists[video_folder]:
+                self.video_handler.set_directory_cached(
+                    video_folder,
+                    state.video_files,
+                    state.video_folder_mtime_ns
+                )
                 self.folder_path_label.setText(video_folder)
                 self.folder_path_label.setStyleSheet("color: black;")
 
@@ -583,6 +695,7 @@ class VideoInferenceTab(QWidget):
             # Reset to default (no folder)
             self.video_handler.videos_dir = None
             self.video_handler.video_files = []
+            self.video_handler.dir_mtime_ns = None
             self.video_handler.current_index = 0
             self.folder_path_label.setText("Not selected")
             self.folder_path_label.setStyleSheet("color: gray;")
@@ -590,29 +703,41 @@ class VideoInferenceTab(QWidget):
             self.video_player.reset()
 
         # Restore models
-        model_paths = data.get("model_paths")
-        if not model_paths and "model_path" in data:
-            # Legacy support
-            model_paths = {0: data["model_path"]}
-
         if model_paths:
             # Ensure model_paths is a dict (JSON might give strings as keys)
             if isinstance(model_paths, dict):
+                to_load = []
                 for slot_str, path in model_paths.items():
                     slot = int(slot_str)
-                    if path and os.path.exists(path):
-                        success = self.inference_engine.load_model(path, slot)
-                        if success:
-                            label = self.model1_path_label if slot == 0 else self.model2_path_label
-                            label.setText(path)
-                            label.setStyleSheet("color: black;")
+                    if path and path_exists[path]:
+                        # Skip the reload (and warm-up) if this slot already holds the model
+                        if (self.inference_engine.is_loaded(slot)
+                                and self.inference_engine.get_model_path(slot) == path):
+                            self._set_model_label(slot, path)
                         else:
-                             warnings.append(f"Failed to load model (Slot {slot+1}): {path}")
+                            to_load.append((slot, path))
                     elif path:
                         warnings.append(f"Model file not found (Slot {slot+1}): {path}")
-        
+
+                # Loading and warming up blocks here, so show progress meanwhile
+                if to_load:
+                    progress = QProgressDialog("Loading models...", None, 0, len(to_load), self)
+                    progress.setWindowTitle("Restoring Session")
+                    progress.setWindowModality(Qt.WindowModal)
+                    progress.setMinimumDuration(0)
+                    for i, (slot, path) in enumerate(to_load):
+                        progress.setLabelText(f"Loading and warming up model for Slot {slot + 1}...\n{path}")
+                        progress.setValue(i)
+                        QApplication.processEvents()
+                        if self.inference_engine.load_model(path, slot):
+                            self._set_model_label(slot, path)
+                        else:
+                            warnings.append(f"Failed to load model (Slot {slot+1}): {path}")
+                    progress.setValue(len(to_load))
+                    progress.close()
+
         # Restore active slot
-        active_slot = data.get("active_model_slot", 0)
+        active_slot = state.active_model_slot
         if active_slot == 1:
             self.model2_radio.setChecked(True)
         else:
@@ -620,27 +745,31 @@ class VideoInferenceTab(QWidget):
         self.inference_engine.set_active_slot(active_slot)
 
         # Restore confidence threshold
-        threshold = data.get("inference_threshold", 0.5)
+        threshold = state.inference_threshold
         slider_value = int(threshold * 100)
         self.confidence_slider.setValue(slider_value)
         self.confidence_value_label.setText(f"{threshold:.2f}")
         self.inference_engine.set_confidence(threshold)
 
+        # Restore inference batch size
+        self.batch_size_spin.setValue(state.inference_batch_size)
+        self.inference_engine.set_batch_size(self.batch_size_spin.value())
+
         # Restore inference enabled state
-        enabled = data.get("inference_enabled", True)
+        enabled = state.inference_enabled
         self.inference_checkbox.setChecked(enabled)
         self.inference_engine.set_enabled(enabled)
 
         # Restore current video selection
-        video_index = data.get("current_video_index", 0)
+        video_index = state.current_video_index
         if self.video_handler.has_videos() and video_index < self.video_handler.get_total_videos():
             self.on_video_selected(video_index)
 
         # Restore export folder
-        export_folder = data.get("export_output_dir")
         if export_folder:
-            if os.path.exists(export_folder):
+            if path_exists[export_folder]:
                 self.export_output_dir = export_folder
+                self.export_worker.forget_directories()
                 self.export_path_label.setText(export_folder)
                 self.export_path_label.setStyleSheet("color: black;")
                 
@@ -660,7 +789,7 @@ class VideoInferenceTab(QWidget):
             self.export_button.setEnabled(self.video_handler.has_current_video())
 
         # Restore splitter state
-        splitter_state = data.get("splitter_state")
+        splitter_state = state.splitter_state
         if splitter_state:
             self.splitter.restoreState(QByteArray.fromBase64(bytes(splitter_state, 'utf-8')))
 
@@ -670,4 +799,5 @@ class VideoInferenceTab(QWidget):
         """Handle widget close"""
         if self.video_thread and self.video_thread.isRunning():
             self.video_thread.stop()
+        self.export_worker.shutdown()
         event.accept()
@@ -3,7 +3,9 @@ Video list widget for browsing video files.
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
                                 QLabel, QLineEdit, QHBoxLayout, QMenu, QApplication)
-from PySide6.QtCore import Qt, Signal, QMimeData, QUrl
+from PySide6.QtCore import Qt, Signal, QMimeData, QUrl, QTimer
+
+from widgets.selection_delegate import SelectionColorDelegate
 
 
 class VideoListWidget(QWidget):
@@ -11,10 +13,14 @@ class VideoListWidget(QWidget):
 
     video_selected = Signal(int)  # Emits the index of the selected video
 
+    # Delay after the last keystroke before the filter is applied
+    FILTER_DELAY_MS = 150
+
     def __init__(self):
         super().__init__()
 
         self.video_files = []
+        self._lower_names = []  # Lowercased filenames by row, for filtering
         self.videos_dir = None
         self.current_index = -1
 
@@ -35,7 +41,12 @@ class VideoListWidget(QWidget):
         filter_label = QLabel("Filter:")
         self.filter_input = QLineEdit()
         self.filter_input.setPlaceholderText("Search videos...")
-        self.filter_input.textChanged.connect(self._filter_videos)
+        # Coalesce keystrokes so only the final text is filtered
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self.filter_input.textChanged.connect(self._filter_timer.start)
         filter_layout.addWidget(filter_label)
         filter_layout.addWidget(self.filter_input)
         layout.addLayout(filter_layout)
@@ -50,7 +61,9 @@ class VideoListWidget(QWidget):
         self.list_widget.setSpacing(2)
         self.list_widget.itemClicked.connect(self._on_item_clicked)
         self.list_widget.setVerticalScrollMode(QListWidget.ScrollPerPixel)
-        self.list_widget.setStyleSheet("QListWidget::item:selected { background-color: #1e90ff; color: white; }")
+        # Selected rows are painted by a delegate rather than a style sheet,
+        # so rows are drawn by the native style without QSS matching
+        self.list_widget.setItemDelegate(SelectionColorDelegate(parent=self.list_widget))
         
         # Enable custom context menu
         self.list_widget.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -68,6 +81,7 @@ class VideoListWidget(QWidget):
         """
         self.videos_dir = videos_dir
         self.video_files = video_files
+        self._lower_names = [f.lower() for f in video_files]
         self.current_index = -1
 
         # Clear existing items
@@ -83,19 +97,31 @@ class VideoListWidget(QWidget):
             item.setData(Qt.UserRole, i)  # Store original index
             self.list_widget.addItem(item)
 
+    def _apply_filter(self):
+        """Filter with the current search text once typing has paused"""
+        self._filter_videos(self.filter_input.text())
+
     def _filter_videos(self, text):
         """Filter video list based on search text"""
         search_text = text.lower()
 
+        # Bind lookups to locals; this loop runs over every row per filter change
+        list_widget = self.list_widget
+        item_at = list_widget.item
         visible_count = 0
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item:
-                filename = item.text().lower()
-                matches = search_text in filename
-                item.setHidden(not matches)
-                if matches:
-                    visible_count += 1
+
+        # Hide rows with painting and signals suspended, then repaint once
+        list_widget.setUpdatesEnabled(False)
+        list_widget.blockSignals(True)
+        try:
+            for row, name_lower in enumerate(self._lower_names):
+                matches = search_text in name_lower
+                item_at(row).setHidden(not matches)
+                visible_count += matches
+        finally:
+            list_widget.blockSignals(False)
+            list_widget.setUpdatesEnabled(True)
+            list_widget.viewport().update()
 
         # Update count label
         if search_text:
@@ -120,18 +146,18 @@ class VideoListWidget(QWidget):
         # Clear previous selection
         self.list_widget.clearSelection()
 
-        # Find and select the item with this index
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item and item.data(Qt.UserRole) == index:
-                item.setSelected(True)
-                self.list_widget.scrollToItem(item, QListWidget.PositionAtCenter)
-                break
+        # Rows are added in index order and never reordered (filtering only
+        # hides them), so the row of a video is its index
+        item = self.list_widget.item(index)
+        if item:
+            item.setSelected(True)
+            self.list_widget.scrollToItem(item, QListWidget.PositionAtCenter)
 
     def clear(self):
         """Clear the video list"""
         self.list_widget.clear()
         self.video_files = []
+        self._lower_names = []
         self.videos_dir = None
         self.current_index = -1
         self.count_label.setText("0 videos")